@@ -1,22 +1,78 @@
 # --- 라이브러리 임포트 ---
 import os
 import json
+import mmap
 import time
 import asyncio
 import logging
+import random
 import datetime as dt
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
 import re  # <--- 이 줄 추가
 
 import discord
 from discord import app_commands
 from dotenv import load_dotenv
-import requests
 import aiohttp
 from bs4 import BeautifulSoup
 
 from datetime import datetime, timezone, timedelta
 
+try:
+    import orjson
+except ImportError:  # orjson이 없으면 표준 json으로 동작
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # pysimdjson이 없으면 _loads로 동작
+    simdjson = None
+
+
+# --- JSON 유틸 (orjson 우선, 없으면 표준 json) ---
+
+def _dumps(obj: Any, *, indent: bool = False) -> str:
+    """obj를 JSON 문자열로 직렬화한다. 한글/일본어는 그대로 유지."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _loads(data: Any) -> Any:
+    """str/bytes/memoryview JSON을 파싱한다."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):  # 표준 json은 memoryview를 받지 않음
+        data = data.tobytes()
+    return json.loads(data)
+
+
+# simdjson 파서는 내부 버퍼째 재사용한다.
+# 파싱 결과(Object/Array)는 다음 parse 전까지만 유효하므로,
+# 사용하는 쪽에서는 await 없이 필요한 값만 꺼낸 뒤 바로 버려야 한다.
+_sjparser = simdjson.Parser() if simdjson is not None else None
+_JSON_ARRAY_TYPES: tuple = (list,) + ((simdjson.Array,) if simdjson is not None else ())
+
+
+def _parse_lazy(data: bytes) -> Any:
+    """bytes JSON을 파싱한다. simdjson이 있으면 필요한 키만 꺼내 쓰는 지연 객체를 반환."""
+    if _sjparser is not None:
+        return _sjparser.parse(data)
+    return _loads(data)
+
+
+def _materialize(obj: Any) -> Any:
+    """_parse_lazy 결과를 일반 파이썬 list/dict로 변환한다."""
+    if hasattr(obj, "as_list"):
+        return obj.as_list()
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    return obj
+
+
 # --- KST 유틸 ---
 KST = timezone(timedelta(hours=9))
 
@@ -24,9 +80,24 @@ def now_kst() -> datetime:
     """항상 KST 기준 현재 시각 반환."""
     return datetime.now(timezone.utc).astimezone(KST)
 
+# 마지막으로 만든 날짜 문자열: (날짜, "YYYYMMDD", "YYYY년 MM월 DD일")
+# 날짜가 바뀔 때만 strftime을 다시 호출한다.
+_date_str_cache: Tuple[Optional[dt.date], str, str] = (None, "", "")
+
+def _date_strings(day: dt.date) -> Tuple[str, str]:
+    """day의 (YYYYMMDD, 'YYYY년 MM월 DD일') 문자열을 반환."""
+    global _date_str_cache
+    if _date_str_cache[0] != day:
+        _date_str_cache = (day, day.strftime("%Y%m%d"), day.strftime("%Y년 %m월 %d일"))
+    return _date_str_cache[1], _date_str_cache[2]
+
 def today_kst_yyyymmdd() -> str:
     """오늘 날짜를 KST 기준 YYYYMMDD로 반환."""
-    return now_kst().strftime("%Y%m%d")
+    return _date_strings(now_kst().date())[0]
+
+def today_kst_display() -> str:
+    """오늘 날짜를 KST 기준 'YYYY년 MM월 DD일'로 반환."""
+    return _date_strings(now_kst().date())[1]
 
 # --- 로깅 설정 ---
 logging.basicConfig(
@@ -55,12 +126,44 @@ if TEST_GUILD_ID:
 # --- 상수 ---
 OHAASA_URL = "https://www.asahi.co.jp/ohaasa/week/horoscope/"
 OHAASA_JSON_URL = "https://www.asahi.co.jp/data/ohaasa2020/horoscope.json"
+GOGO_URL = "https://www.tv-asahi.co.jp/goodmorning/uranai/"
 GEMINI_API_URL = (
     "https://generativelanguage.googleapis.com/v1beta/"
     "models/gemini-2.5-flash:generateContent"
 )
 
+# 재시도할 Gemini 응답 코드 / Retry-After를 따를 때의 최대 대기 시간(초)
+GEMINI_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+GEMINI_RETRY_AFTER_MAX = 60.0
+
 GUILD_CONFIG_PATH = "guild_config.json"
+SAVE_DEBOUNCE_SECONDS = 2.0  # 설정 변경 후 이 시간 동안 모인 변경을 한 번에 저장
+HOROSCOPE_CACHE_DIR = "ohaasa_cache"  # 날짜별 번역 결과 파일 (ohaasa_cache/YYYYMMDD.json)
+_HOROSCOPE_CACHE_FILE_RE = re.compile(r"^\d{8}\.json$")
+WARMUP_CONCURRENCY = 5  # 봇 시작 시 캐시 예열 동시 실행 수
+
+# 오하아사 본문의 탭 문자를 공백으로 바꾸는 변환표
+_TAB_TRANS = str.maketrans({"\t": " "})
+
+# 오하아사 JSON의 horoscope_st(별자리 코드) -> 한국어 별자리 이름
+SIGN_CODE_TO_KO = {
+    "01": "양자리",
+    "02": "황소자리",
+    "03": "쌍둥이자리",
+    "04": "게자리",
+    "05": "사자자리",
+    "06": "처녀자리",
+    "07": "천칭자리",
+    "08": "전갈자리",
+    "09": "사수자리",
+    "10": "염소자리",
+    "11": "물병자리",
+    "12": "물고기자리",
+}
+
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+FEED_TIMEOUT = aiohttp.ClientTimeout(total=15)  # 오하아사/고고 별자리 페이지
+GEMINI_TIMEOUT = aiohttp.ClientTimeout(total=180)  # 12개 항목 번역 + 구조화 출력은 오래 걸릴 수 있음
 
 # --- 디스코드 클라이언트 ---
 intents = discord.Intents.default()
@@ -69,20 +172,95 @@ tree = app_commands.CommandTree(client)
 
 # guild_id(int) -> 설정 dict
 guild_settings: Dict[int, Dict[str, Any]] = {}
+# guild_config.json에서 해석하지 못한 항목 (저장할 때 원본 그대로 다시 쓴다)
+_unparsed_guild_entries: Dict[str, Any] = {}
 
-# 길드별 오늘 운세 캐시: { guild_id: { "date": "YYYYMMDD", "data": [ ...translated... ] } }
-# 기존: horoscope_cache: Dict[int, Dict[str, Any]] = {}
-# 변경: 날짜별로 딱 하나만 저장
+# 오늘 운세 캐시 (모든 길드 공용): { "YYYYMMDD": { "date", "source", "source_url", "data": [ ...translated... ] } }
 horoscope_cache: Dict[str, Any] = {}
 cache_lock = asyncio.Lock()
-fetch_lock = asyncio.Lock() # <--- 데이터 로딩 자체를 보호할 락 추가
+# 날짜별 번역 진행 중 (API 키, Future) — 동시에 들어온 요청은 Gemini 호출 하나를 함께 기다린다
+_inflight: Dict[str, Tuple[Any, asyncio.Future]] = {}
+
+# 번역 전 일본어 원문 캐시 (길드와 무관): { "YYYYMMDD": { "source", "source_url", "text" } }
+# 번역이 실패해도 원문은 다시 받아오지 않도록 따로 보관한다.
+_ja_cache: Dict[str, Dict[str, str]] = {}
+# 날짜별 원문 로딩 진행 중 (None, Future)
+_ja_inflight: Dict[str, Tuple[Any, asyncio.Future]] = {}
+
+# 봇 수명 동안 재사용하는 공용 HTTP 세션 (커넥션 풀 / keep-alive 유지)
+_http_session: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+
+# 설정 저장 예약 핸들 / 진행 중인 저장 태스크 / 파일 쓰기 직렬화 락
+_save_handle: Optional[asyncio.TimerHandle] = None
+_save_task: Optional[asyncio.Task] = None
+_save_lock = asyncio.Lock()
+
+
+# --- 공용 HTTP 세션 ---
+
+async def get_session() -> aiohttp.ClientSession:
+    """공용 aiohttp 세션을 반환한다. 없으면 처음 한 번만 생성한다."""
+    global _http_session
+
+    if _http_session is not None and not _http_session.closed:
+        return _http_session
+
+    async with _session_lock:
+        if _http_session is None or _http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=100,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            )
+            _http_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=HTTP_TIMEOUT,
+            )
+        return _http_session
+
+
+async def close_session() -> None:
+    """봇 종료 시 공용 HTTP 세션을 닫는다."""
+    global _http_session
+
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
 
 
 # --- 길드 설정 로드/저장 ---
 
+# 숫자 필드와 값을 변환할 수 없을 때 쓸 기본값
+_GUILD_INT_FIELDS = {
+    "channel_id": None,
+    "mention_role_id": None,
+    "post_hour": 8,
+    "post_minute": 0,
+}
+
+
+def _normalize_guild_config(gid: str, cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    파일에서 읽은 설정의 숫자 필드를 int로 맞춰 둔다. (사용할 때마다 int()를 하지 않도록)
+    변환할 수 없는 필드만 기본값으로 되돌리고, 나머지 설정(API 키 등)은 그대로 둔다.
+    """
+    for key, default in _GUILD_INT_FIELDS.items():
+        value = cfg.get(key)
+        if value is None or value == "":
+            cfg[key] = default
+            continue
+        try:
+            cfg[key] = int(value)
+        except (TypeError, ValueError):
+            logging.error(f"길드 {gid} 설정의 {key} 값({value!r})이 올바르지 않아 기본값으로 되돌립니다.")
+            cfg[key] = default
+    return cfg
+
+
 def load_guild_config() -> None:
     """guild_config.json에서 서버별 설정을 불러온다."""
-    global guild_settings
+    global guild_settings, _unparsed_guild_entries
 
     if not os.path.exists(GUILD_CONFIG_PATH):
         logging.info("guild_config.json이 없어 새로 생성 예정입니다.")
@@ -90,27 +268,84 @@ def load_guild_config() -> None:
         return
 
     try:
-        with open(GUILD_CONFIG_PATH, "r", encoding="utf-8") as f:
-            raw = json.load(f)
+        # 파일을 str로 읽어 들이지 않고 mmap한 바이트를 그대로 파서에 넘긴다
+        with open(GUILD_CONFIG_PATH, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            raw = _loads(view)
+        if not isinstance(raw, dict):
+            raise ValueError("최상위 값이 객체가 아닙니다")
     except Exception as e:
         logging.error(f"guild_config.json 로드 중 오류: {e}")
         guild_settings = {}
         return
 
-    guild_settings = {int(gid): cfg for gid, cfg in raw.items()}
+    guild_settings = {}
+    _unparsed_guild_entries = {}
+    for gid, cfg in raw.items():
+        try:
+            guild_id = int(gid)
+        except ValueError:
+            guild_id = None
+        if guild_id is None or not isinstance(cfg, dict):
+            # 해석할 수 없는 항목도 저장 시 그대로 다시 써서 설정이 사라지지 않게 한다
+            logging.error(f"길드 {gid} 설정 형식이 올바르지 않아 사용하지 않고 원본 그대로 보존합니다.")
+            _unparsed_guild_entries[gid] = cfg
+            continue
+        guild_settings[guild_id] = _normalize_guild_config(gid, cfg)
     logging.info(f"총 {len(guild_settings)}개의 길드 설정을 불러왔습니다.")
 
 
-def save_guild_config() -> None:
-    """현재 설정을 guild_config.json에 저장한다."""
+def _write_bytes_atomic(path: str, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체해, 저장 도중 종료돼도 파일이 깨지지 않게 한다."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+async def save_guild_config() -> None:
+    """현재 설정을 guild_config.json에 저장한다. 파일 쓰기는 이벤트 루프 밖에서 수행."""
     try:
-        raw = {str(gid): cfg for gid, cfg in guild_settings.items()}
-        with open(GUILD_CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(raw, f, ensure_ascii=False, indent=2)
+        # 직렬화는 루프 스레드에서 끝내 두어, 쓰는 도중 설정이 바뀌어도 안전하게 한다.
+        raw = dict(_unparsed_guild_entries)
+        raw.update((str(gid), cfg) for gid, cfg in guild_settings.items())
+        data = _dumps(raw, indent=True).encode("utf-8")
+        async with _save_lock:
+            await asyncio.to_thread(_write_bytes_atomic, GUILD_CONFIG_PATH, data)
     except Exception as e:
         logging.error(f"guild_config.json 저장 중 오류: {e}")
 
 
+def _run_scheduled_save() -> None:
+    global _save_handle, _save_task
+    _save_handle = None
+    _save_task = asyncio.create_task(save_guild_config())
+
+
+def schedule_save() -> None:
+    """
+    설정 저장을 예약한다. SAVE_DEBOUNCE_SECONDS 안에 여러 번 불려도
+    실제 파일 쓰기는 한 번만 일어난다.
+    """
+    global _save_handle
+    if _save_handle is not None:
+        return
+    loop = asyncio.get_running_loop()
+    _save_handle = loop.call_later(SAVE_DEBOUNCE_SECONDS, _run_scheduled_save)
+
+
+async def flush_guild_config() -> None:
+    """예약된 저장이 있으면 지금 바로 저장한다. (봇 종료 시 사용)"""
+    global _save_handle
+    if _save_handle is not None:
+        _save_handle.cancel()
+        _save_handle = None
+        await save_guild_config()
+    elif _save_task is not None and not _save_task.done():
+        await _save_task
+
+
 def get_or_create_guild_settings(guild_id: int) -> Dict[str, Any]:
     """해당 길드의 설정이 없으면 기본값으로 생성하고 반환."""
     if guild_id not in guild_settings:
@@ -142,6 +377,19 @@ def is_guild_owner():
 
 # --- Gemini 번역 함수 (재시도 포함) ---
 
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """
+    재시도 전 대기 시간(초).
+    Retry-After(초 단위)가 있으면 그대로 따르고, 없으면 지수 백오프 + 지터를 쓴다.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), GEMINI_RETRY_AFTER_MAX)
+        except ValueError:
+            pass  # HTTP-date 형식 등은 무시하고 백오프로 대체
+    return min(2 ** attempt, 10) + random.random()
+
+
 async def translate_text(
     japanese_text: str,
     gemini_api_key: str,
@@ -158,7 +406,11 @@ async def translate_text(
         "3. IMPORTANT: Sort the final JSON array by 'rank' in ascending order (from 1 to 12). "
         "4. The 'description_ko' field MUST ONLY contain the horoscope advice. "
         "5. DO NOT include any 'Lucky Color', 'Lucky Item', or 'Scores' in the 'description_ko' field. "
-        "6. Return ONLY the raw JSON array of 12 objects."
+        "6. Return ONLY the raw JSON array of 12 objects. "
+        "7. If the input is a JSON array of [rank, sign_code, description_jp] arrays, "
+        "translate description_jp and use this table to turn sign_code into 'sign_ko': "
+        + ", ".join(f"{code}={name}" for code, name in SIGN_CODE_TO_KO.items())
+        + "."
     )
 
     response_schema = {
@@ -183,44 +435,52 @@ async def translate_text(
         },
     }
 
-    headers = {"Content-Type": "application/json"}
+    # API 키는 URL이 아니라 헤더로 보낸다 (예외 메시지/로그에 URL과 함께 키가 남지 않도록)
+    headers = {"Content-Type": "application/json", "x-goog-api-key": gemini_api_key}
 
     for attempt in range(max_retries):
+        retry_after: Optional[str] = None
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(f"{GEMINI_API_URL}?key={gemini_api_key}", headers=headers, json=payload) as resp:
-                    if resp.status == 200:
-                        result = await resp.json()
-                        json_string = result["candidates"][0]["content"]["parts"][0]["text"].strip()
-                        if json_string.startswith("```"):
-                            json_string = json_string.strip("`").replace("json", "", 1).strip()
-                        return json.loads(json_string)
-
-                    if 500 <= resp.status < 600:
-                        if attempt < max_retries - 1:
-                            await asyncio.sleep(1 + attempt)
-                            continue
+            session = await get_session()
+            async with session.post(
+                GEMINI_API_URL,
+                headers=headers,
+                json=payload,
+                timeout=GEMINI_TIMEOUT,
+            ) as resp:
+                if resp.status == 200:
+                    result = await resp.json(loads=_loads)
+                    json_string = result["candidates"][0]["content"]["parts"][0]["text"].strip()
+                    if json_string.startswith("```"):
+                        json_string = json_string.strip("`").replace("json", "", 1).strip()
+                    return _materialize(_parse_lazy(json_string.encode("utf-8")))
+
+                if resp.status not in GEMINI_RETRYABLE_STATUSES:
                     return None
+                retry_after = resp.headers.get("Retry-After")
         except Exception as e:
-            if attempt < max_retries - 1:
-                await asyncio.sleep(1 + attempt)
-                continue
-            return None
+            logging.warning(f"Gemini 요청 실패 (시도 {attempt + 1}/{max_retries}): {type(e).__name__}")
+
+        # 응답을 닫은 뒤에 기다려서, 대기하는 동안 커넥션을 붙잡고 있지 않게 한다
+        if attempt < max_retries - 1:
+            await asyncio.sleep(_retry_delay(attempt, retry_after))
     return None
 
 
 # --- 오하아사 JSON 가져오기 ---
 
-def fetch_horoscope_data_sync():
+async def fetch_horoscope_data() -> Optional[str]:
     """오하아사 JSON API를 로드합니다."""
     logging.info("오하아사 운세 데이터(JSON) 가져오기 시작")
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(OHAASA_JSON_URL, headers=headers, timeout=15)
-        resp.raise_for_status()
-        
-        data = resp.json()
-        if not isinstance(data, list) or not data:
+        session = await get_session()
+        async with session.get(OHAASA_JSON_URL, headers=headers, timeout=FEED_TIMEOUT) as resp:
+            resp.raise_for_status()
+            body = await resp.read()
+
+        data = _parse_lazy(body)
+        if not isinstance(data, _JSON_ARRAY_TYPES) or not data:
             return None
 
         root = data[0]
@@ -229,104 +489,281 @@ def fetch_horoscope_data_sync():
             return None
 
         details = root.get("detail",[])
-        
-        # 이전처럼 파이썬에서 하나하나 텍스트를 자르지 않고, 
-        # 원본 JSON을 그대로 줘서 Gemini가 숨겨진 럭키 아이템이나 색상도 알아서 찾게 만듭니다.
-        return json.dumps(details, ensure_ascii=False)
+
+        # Gemini에는 [순위, 별자리 코드, 본문] 배열만 간결한 JSON으로 넘긴다 (입력 토큰 절약).
+        # 키 이름을 반복하지 않고, 별자리 코드 -> 한국어 이름 표는 system prompt에 한 번만 들어간다.
+        fields = (
+            (d.get("ranking_no"), d.get("horoscope_st"), d.get("horoscope_text"))
+            for d in details
+        )
+        result = [
+            [int(rank_str), str(sign_code), str(text).translate(_TAB_TRANS).strip()]
+            for rank_str, sign_code, text in fields
+            if rank_str and sign_code and text
+        ]
+
+        if not result:
+            return None
+        return _dumps(result)
 
     except Exception as e:
         logging.error(f"오하아사 JSON 로드 중 오류: {e}")
         return None
 
-def fetch_gogo_data_sync() -> Optional[str]:
-    """고고 별자리 파싱 (초고속 압축 최적화)"""
+def _extract_gogo_text(html: bytes) -> str:
+    """고고 별자리 HTML에서 본문 텍스트만 추려낸다 (초고속 압축 최적화)"""
+    # bytes를 그대로 넘기면 BeautifulSoup이 meta 태그로 인코딩을 판별한다.
+    soup = BeautifulSoup(html, "html.parser")
+
+    # 불필요한 태그 완전 삭제
+    for tag in soup(["script", "style", "header", "footer", "nav", "noscript", "svg", "img", "a"]):
+        tag.decompose()
+
+    # 정규식을 이용해 모든 공백과 줄바꿈을 하나의 띄어쓰기로 압축 (토큰 낭비 방지)
+    text_content = re.sub(r'\s+', ' ', soup.get_text(strip=True))
+
+    # 3000자만 넘겨도 핵심 운세 정보는 다 들어갑니다.
+    return text_content[:3000]
+
+
+async def fetch_gogo_data() -> Optional[str]:
+    """고고 별자리 페이지를 받아 본문 텍스트를 반환한다."""
     logging.info("고고 별자리 데이터 가져오기 시작")
-    url = "https://www.tv-asahi.co.jp/goodmorning/uranai/"
     try:
         headers = {"User-Agent": "Mozilla/5.0"}
-        resp = requests.get(url, headers=headers, timeout=15)
-        resp.raise_for_status()
-        resp.encoding = resp.apparent_encoding
+        session = await get_session()
+        async with session.get(GOGO_URL, headers=headers, timeout=FEED_TIMEOUT) as resp:
+            resp.raise_for_status()
+            html = await resp.read()
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        
-        # 불필요한 태그 완전 삭제
-        for tag in soup(["script", "style", "header", "footer", "nav", "noscript", "svg", "img", "a"]):
-            tag.decompose()
-            
-        # 정규식을 이용해 모든 공백과 줄바꿈을 하나의 띄어쓰기로 압축 (토큰 낭비 방지)
-        text_content = re.sub(r'\s+', ' ', soup.get_text(strip=True))
-        
-        # 3000자만 넘겨도 핵심 운세 정보는 다 들어갑니다.
-        return text_content[:3000]
+        # HTML 파싱은 CPU 작업이라 이벤트 루프 밖에서 수행
+        return await asyncio.to_thread(_extract_gogo_text, html)
 
     except Exception as e:
         logging.error(f"고고 별자리 파싱 오류: {e}")
         return None
 
-async def get_today_horoscope_for_guild(
-    guild_id: int,
-    gemini_api_key: str,
-) -> Optional[Dict[str, Any]]:
+# --- 번역 캐시 파일 (재시작 시 재사용) ---
+
+def _horoscope_cache_path(date_str: str) -> str:
+    return os.path.join(HOROSCOPE_CACHE_DIR, f"{date_str}.json")
+
+
+def load_horoscope_cache() -> None:
+    """오늘자 번역 캐시 파일이 있으면 horoscope_cache를 미리 채운다. (재시작 시 Gemini 재호출 방지)"""
     today = today_kst_yyyymmdd()
+    path = _horoscope_cache_path(today)
+    if not os.path.exists(path):
+        return
 
-    # 1단계: 이미 캐시가 있는지 확인
-    async with cache_lock:
-        if horoscope_cache.get(today):
-            return horoscope_cache[today]
+    try:
+        with open(path, "rb") as f:
+            result = _loads(f.read())
+    except Exception as e:
+        logging.error(f"운세 캐시 파일 로드 중 오류: {e}")
+        return
 
-    # 2단계: 캐시가 없으면, 로딩 락을 획득하여 한 번만 로드하도록 함
-    async with fetch_lock:
-        # 락 획득 후 다시 한번 캐시 확인 (다른 길드가 이미 로드했을 수 있으므로)
-        async with cache_lock:
-            if horoscope_cache.get(today):
-                return horoscope_cache[today]
+    if isinstance(result, dict) and result.get("date") == today and result.get("data"):
+        horoscope_cache[today] = result
+        logging.info(f"오늘자({today}) 번역 캐시를 파일에서 불러왔습니다.")
 
-        logging.info(f"===> 오늘자({today}) 운세 단독 로드 시작 (딱 한 번만 실행됨) <==")
-        
-        japanese_data = await asyncio.to_thread(fetch_horoscope_data_sync)
-        if not japanese_data:
-            logging.warning("오하아사 데이터 없음. 고고 별자리 전환.")
-            japanese_data = await asyncio.to_thread(fetch_gogo_data_sync)
-            
-        translated_data = await translate_text(japanese_data, gemini_api_key) if japanese_data else None
-
-        if translated_data:
-            # ==========================================
-            # 💡 이 부분을 추가하세요: 1위부터 12위까지 순서대로 정렬
+
+def _write_horoscope_cache_file(date_str: str, data: bytes) -> None:
+    """date_str의 번역 결과를 파일로 저장하고, 지난 날짜 파일은 지운다."""
+    os.makedirs(HOROSCOPE_CACHE_DIR, exist_ok=True)
+    path = _horoscope_cache_path(date_str)
+    _write_bytes_atomic(path, data)
+
+    # 이 봇이 만든 날짜 파일만 지운다
+    for name in os.listdir(HOROSCOPE_CACHE_DIR):
+        if name != os.path.basename(path) and _HOROSCOPE_CACHE_FILE_RE.match(name):
             try:
-                translated_data.sort(key=lambda x: int(x.get("rank", 99)))
-            except Exception as e:
-                logging.error(f"순위 정렬 중 오류 발생: {e}")
-            # ==========================================
-
-            result = {
-                "date": today,
-                "source": "오하아사" if japanese_data else "고 고 별자리",
-                "source_url": OHAASA_URL if japanese_data else "https://www.tv-asahi.co.jp/goodmorning/uranai/",
-                "data": translated_data,
-            }
-            async with cache_lock:
-                horoscope_cache[today] = result
+                os.remove(os.path.join(HOROSCOPE_CACHE_DIR, name))
+            except OSError as e:
+                logging.warning(f"지난 운세 캐시 파일 삭제 실패 ({name}): {e}")
+
+
+async def save_horoscope_cache(result: Dict[str, Any]) -> None:
+    """번역 결과를 캐시 파일에 저장한다. 파일 쓰기는 이벤트 루프 밖에서 수행."""
+    try:
+        data = _dumps(result).encode("utf-8")
+        await asyncio.to_thread(_write_horoscope_cache_file, result["date"], data)
+    except Exception as e:
+        logging.error(f"운세 캐시 파일 저장 중 오류: {e}")
+
+
+async def _single_flight(
+    cache: Dict[str, Any],
+    inflight: Dict[str, Tuple[Any, asyncio.Future]],
+    key: str,
+    load: Callable[[], Awaitable[Any]],
+    loader_id: Any = None,
+) -> Any:
+    """
+    cache[key]가 있으면 바로 반환하고, 없으면 load()로 채운다.
+    동시에 여러 요청이 들어와도 load()는 한 번만 실행되고,
+    나머지 요청은 진행 중인 Future의 결과를 함께 기다린다.
+    loader_id가 다른 요청(예: 다른 API 키)의 로드가 실패했다면,
+    기다리던 쪽은 실패를 그대로 받지 않고 자기 load()로 다시 시도한다.
+    """
+    while True:
+        # 캐시 조회는 락 없이 한다. (dict 조회 한 번이라 await 지점이 없다)
+        cached = cache.get(key)
+        if cached:
+            return cached
+
+        # 캐시가 비어 있을 때만 락을 잡고, 그 사이 채워졌는지 다시 확인한다.
+        async with cache_lock:
+            cached = cache.get(key)
+            if cached:
+                return cached
+
+            entry = inflight.get(key)
+            is_loader = entry is None
+            if is_loader:
+                future = asyncio.get_running_loop().create_future()
+                inflight[key] = (loader_id, future)
+            else:
+                flight_id, future = entry
+
+        if is_loader:
+            break
+
+        # 기다리던 쪽이 취소돼도 공용 Future는 취소되지 않도록 shield
+        result = await asyncio.shield(future)
+        if result or flight_id == loader_id:
             return result
-            
+        # 다른 loader_id의 로드가 실패 -> 내 load()로 다시 시도
+
+    result = None
+    try:
+        result = await load()
+    finally:
+        async with cache_lock:
+            if result:
+                cache.clear()  # 지난 날짜 항목은 더 이상 쓰지 않음
+                cache[key] = result
+            inflight.pop(key, None)
+        if not future.done():
+            future.set_result(result)
+
+    return result
+
+
+async def _load_japanese_source() -> Optional[Dict[str, str]]:
+    """오하아사 원문을 가져오고, 없으면 고고 별자리로 대체한다."""
+    japanese_data = await fetch_horoscope_data()
+    if japanese_data:
+        return {"source": "오하아사", "source_url": OHAASA_URL, "text": japanese_data}
+
+    logging.warning("오하아사 데이터 없음. 고고 별자리 전환.")
+    japanese_data = await fetch_gogo_data()
+    if japanese_data:
+        return {"source": "고 고 별자리", "source_url": GOGO_URL, "text": japanese_data}
+    return None
+
+
+async def get_today_japanese_source(today: str) -> Optional[Dict[str, str]]:
+    """오늘자 일본어 원문을 반환한다. 원문은 길드와 무관하므로 하루 한 번만 가져온다."""
+    return await _single_flight(_ja_cache, _ja_inflight, today, _load_japanese_source)
+
+
+async def _translate_today(today: str, gemini_api_key: str) -> Optional[Dict[str, Any]]:
+    """오늘자 원문을 Gemini로 번역해 캐시에 넣을 결과 dict를 만든다."""
+    japanese = await get_today_japanese_source(today)
+    if not japanese:
+        return None
+
+    logging.info(f"===> 오늘자({today}) {japanese['source']} 번역 시작 (딱 한 번만 실행됨) <==")
+    translated_data = await translate_text(japanese["text"], gemini_api_key)
+    if not translated_data:
         return None
 
+    # 1위부터 12위까지 순서대로 정렬
+    try:
+        translated_data.sort(key=lambda x: int(x.get("rank", 99)))
+    except Exception as e:
+        logging.error(f"순위 정렬 중 오류 발생: {e}")
+
     result = {
         "date": today,
-        "source": source_name,
-        "source_url": source_url,
+        "source": japanese["source"],
+        "source_url": japanese["source_url"],
         "data": translated_data,
     }
+    await save_horoscope_cache(result)
+    return result
 
-    # 3) 공통 캐시에 저장
-    async with cache_lock:
-        horoscope_cache[today] = result
 
-    return result
+async def get_today_horoscope_for_guild(
+    guild_id: int,
+    gemini_api_key: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    오늘자 번역된 운세를 반환한다. 모든 길드가 같은 캐시를 공유하며,
+    캐시가 비어 있을 때 동시에 들어온 요청도 번역은 한 번만 수행한다.
+    다른 길드의 키로 한 번역이 실패하면 이 길드의 키로 다시 시도한다.
+    """
+    today = today_kst_yyyymmdd()
+    return await _single_flight(
+        horoscope_cache,
+        _inflight,
+        today,
+        lambda: _translate_today(today, gemini_api_key),
+        loader_id=gemini_api_key,
+    )
 
 # --- 디스코드 게시 로직 ---
 
+def _render_horoscope(horoscope_info: Dict[str, Any]) -> Dict[str, Any]:
+    """번역된 운세로 게시용 Embed와 스레드 상세 텍스트를 만든다."""
+    source_name = horoscope_info["source"]
+    source_url = horoscope_info["source_url"]
+    translated_data = horoscope_info["data"]
+    date_str = today_kst_display()
+
+    embed = discord.Embed(
+        title=f"📅 {date_str} 오늘의 {source_name} 랭킹",
+        description=f"[원문 출처: {source_name}](<{source_url}>)",
+        color=0x4E72B7 if source_name == "오하아사" else 0xFF9900,
+    )
+
+    top_rankings = translated_data[:6]
+    bottom_rankings = translated_data[6:]
+
+    # 메인 Embed에는 깔끔하게 순위와 별자리만 표시 (rank가 숫자로 오기 때문에 '위'를 붙여줌)
+    top_list = "\n".join(f"**{item['rank']}위** — {item['sign_ko']}" for item in top_rankings)
+    bottom_list = "\n".join(f"**{item['rank']}위** — {item['sign_ko']}" for item in bottom_rankings)
+
+    embed.add_field(name="🥇 상위 랭킹 (1~6위)", value=top_list or "데이터 없음", inline=True)
+    embed.add_field(name="⬇️ 하위 랭킹 (7~12위)", value=bottom_list or "데이터 없음", inline=True)
+
+    # 스레드에 예쁘게 포맷팅하여 올리는 헬퍼 함수
+    def build_details_text(rankings, title):
+        return f"**{title}**\n" + "".join(
+            f"\n**{item['rank']}위 {item['sign_ko']}**\n> {item['description_ko']}\n"
+            for item in rankings
+        )
+
+    return {
+        "date_str": date_str,
+        "embed": embed,
+        "top_detail": build_details_text(top_rankings, "🥇 상위 랭킹 상세"),
+        "bottom_detail": build_details_text(bottom_rankings, "⬇️ 하위 랭킹 상세"),
+    }
+
+
+def _get_rendered_horoscope(horoscope_info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    캐시된 운세에 붙여 둔 Embed/상세 텍스트를 반환한다.
+    같은 날 여러 길드가 게시해도 렌더링은 처음 한 번만 한다.
+    """
+    rendered = horoscope_info.get("rendered")
+    if rendered is None:
+        rendered = horoscope_info["rendered"] = _render_horoscope(horoscope_info)
+    return rendered
+
+
 async def fetch_and_post_horoscope(
     channel: discord.abc.Messageable,
     gemini_api_key: str,
@@ -366,55 +803,29 @@ async def fetch_and_post_horoscope(
         )
         return
         
-    # 정보 추출
-    source_name = horoscope_info["source"]
-    source_url = horoscope_info["source_url"]
-    translated_data = horoscope_info["data"]
-
     # 3. 디스코드 Embed + 스레드로 게시
     try:
-        date_str = now_kst().strftime("%Y년 %m월 %d일")
-
-        embed = discord.Embed(
-            title=f"📅 {date_str} 오늘의 {source_name} 랭킹",
-            description=f"[원문 출처: {source_name}](<{source_url}>)",
-            color=0x4E72B7 if source_name == "오하아사" else 0xFF9900,
-        )
+        rendered = _get_rendered_horoscope(horoscope_info)
+        date_str = rendered["date_str"]
 
-        top_rankings = translated_data[:6]
-        bottom_rankings = translated_data[6:]
-
-        # 메인 Embed에는 깔끔하게 순위와 별자리만 표시 (rank가 숫자로 오기 때문에 '위'를 붙여줌)
-        top_list = "\n".join(f"**{item['rank']}위** — {item['sign_ko']}" for item in top_rankings)
-        bottom_list = "\n".join(f"**{item['rank']}위** — {item['sign_ko']}" for item in bottom_rankings)
-
-        embed.add_field(name="🥇 상위 랭킹 (1~6위)", value=top_list or "데이터 없음", inline=True)
-        embed.add_field(name="⬇️ 하위 랭킹 (7~12위)", value=bottom_list or "데이터 없음", inline=True)
-
-        await loading_message.edit(content=None, embed=embed)
-        initial_message = loading_message
-
-        # 상세 내용 스레드 생성
-        try:
-            thread = await initial_message.create_thread(
+        # Embed 수정과 상세 내용 스레드 생성은 서로 독립적이라 동시에 요청한다
+        edit_result, thread = await asyncio.gather(
+            loading_message.edit(content=None, embed=rendered["embed"]),
+            loading_message.create_thread(
                 name=f"{date_str} 별자리 운세 상세",
                 auto_archive_duration=60,
-            )
-        except Exception as e:
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(edit_result, BaseException):
+            raise edit_result
+        if isinstance(thread, BaseException):
             thread = channel
 
-        # 스레드에 예쁘게 포맷팅하여 올리는 헬퍼 함수
-        # 헬퍼 함수 간소화
-        def build_details_text(rankings, title):
-            text = f"**{title}**\n"
-            for item in rankings:
-                text += f"\n**{item['rank']}위 {item['sign_ko']}**\n"
-                text += f"> {item['description_ko']}\n"
-            return text
-
-        top_details_text = build_details_text(top_rankings, "🥇 상위 랭킹 상세")
-        bottom_details_text = build_details_text(bottom_rankings, "⬇️ 하위 랭킹 상세")
+        top_details_text = rendered["top_detail"]
+        bottom_details_text = rendered["bottom_detail"]
 
+        # 상위 -> 하위 순서가 보장돼야 하므로 상세 메시지는 차례로 보낸다
         await thread.send(top_details_text)
         await thread.send(bottom_details_text)
 
@@ -427,68 +838,134 @@ async def fetch_and_post_horoscope(
 
 # --- 자동 스케줄러 ---
 
-async def scheduler_loop():
+# guild_id -> 길드별 자동 게시 태스크 / 설정 변경 시 태스크를 깨우는 이벤트
+_guild_tasks: Dict[int, asyncio.Task] = {}
+_guild_wakeups: Dict[int, asyncio.Event] = {}
+
+
+def _next_post_time(now: datetime, target: int, today_done: bool) -> datetime:
+    """
+    다음 자동 게시 시각(KST)을 계산한다. target은 하루 중 몇 번째 분인지(hour*60+minute).
+    설정한 '분'이 이미 지났거나 오늘 이미 게시했다면(today_done) 다음 날로 넘긴다.
     """
-    모든 길드 설정을 기준으로,
-    매 분마다 현재 시간이 설정된 시각과 일치하면 자동으로 운세를 게시한다.
+    next_run = now.replace(hour=target // 60, minute=target % 60, second=0, microsecond=0)
+    if today_done or now.hour * 60 + now.minute > target:
+        next_run += timedelta(days=1)
+    return next_run
+
+
+async def _guild_scheduler(guild_id: int) -> None:
+    """
+    한 길드의 자동 게시 태스크.
+    다음 게시 시각까지 잠들어 있다가 깨어나 운세를 게시한다.
+    설정이 바뀌면 wakeup 이벤트로 깨어나 다음 시각을 다시 계산한다.
     시간 기준은 항상 KST(UTC+9)를 사용한다.
     """
     await client.wait_until_ready()
-    logging.info("자동 운세 게시 스케줄러 시작 (KST 기준)")
+    wakeup = _guild_wakeups[guild_id]
+    attempted_date: Optional[str] = None  # 채널을 못 찾는 등 게시를 시도만 한 날짜
 
     while not client.is_closed():
+        wakeup.clear()
+        cfg = get_guild_settings(guild_id)
+
+        # 채널/키 미설정 시 설정될 때까지 대기
+        if not cfg or not cfg.get("channel_id") or not cfg.get("gemini_api_key"):
+            await wakeup.wait()
+            continue
+
+        channel_id = cfg.get("channel_id")
+        gemini_key = cfg.get("gemini_api_key")
+        hour = cfg["post_hour"]
+        minute = cfg["post_minute"]
+        target = hour * 60 + minute
+
+        # 날짜 문자열은 깨어날 때 한 번만 만든다
         now = now_kst()
-        today_str = now.strftime("%Y%m%d")
-
-        for guild_id, cfg in guild_settings.items():
-            channel_id = cfg.get("channel_id")
-            hour = cfg.get("post_hour")
-            minute = cfg.get("post_minute")
-            gemini_key = cfg.get("gemini_api_key")
-            last_post_date = cfg.get("last_post_date")
-
-            # 채널/키 미설정 시 스킵
-            if not channel_id or not gemini_key:
-                continue
-
-            # 이미 오늘 올렸으면 스킵
-            if last_post_date == today_str:
-                continue
-
-            # 설정한 시간과 현재 KST 시간이 일치할 때만 발사
-            if now.hour == int(hour) and now.minute == int(minute):
-                channel = client.get_channel(int(channel_id))
-                if not channel:
-                    logging.error(
-                        f"길드 {guild_id}의 채널 ID {channel_id}를 찾을 수 없습니다."
-                    )
-                    continue
-
-                # 멘션 텍스트 구성
-                mention_text: Optional[str] = None
-                mode = cfg.get("mention_mode", "none")
-                role_id = cfg.get("mention_role_id")
-
-                if mode == "everyone":
-                    mention_text = "@everyone"
-                elif mode == "role" and role_id:
-                    mention_text = f"<@&{int(role_id)}>"
-
-                logging.info(
-                    f"길드 {guild_id}에 대해 자동 운세 게시 실행 (채널 {channel_id}, {hour:02d}:{minute:02d} KST)"
-                )
-                client.loop.create_task(
-                    fetch_and_post_horoscope(channel, gemini_key, mention_text, guild_id)
-                )
+        today_str = _date_strings(now.date())[0]
+        today_done = today_str in (cfg.get("last_post_date"), attempted_date)
+        next_run = _next_post_time(now, target, today_done)
+
+        try:
+            await asyncio.wait_for(wakeup.wait(), timeout=(next_run - now).total_seconds())
+            continue  # 설정이 바뀌었으므로 다음 시각을 다시 계산
+        except asyncio.TimeoutError:
+            pass
+
+        post_date = today_str if next_run.date() == now.date() else next_run.strftime("%Y%m%d")
+        attempted_date = post_date
+
+        channel = client.get_channel(channel_id)
+        if not channel:
+            logging.error(
+                f"길드 {guild_id}의 채널 ID {channel_id}를 찾을 수 없습니다."
+            )
+            continue
+
+        # 멘션 텍스트 구성
+        mention_text: Optional[str] = None
+        mode = cfg.get("mention_mode", "none")
+        role_id = cfg.get("mention_role_id")
 
-                cfg["last_post_date"] = today_str
-                save_guild_config()
+        if mode == "everyone":
+            mention_text = "@everyone"
+        elif mode == "role" and role_id:
+            mention_text = f"<@&{role_id}>"
+
+        logging.info(
+            f"길드 {guild_id}에 대해 자동 운세 게시 실행 (채널 {channel_id}, {hour:02d}:{minute:02d} KST)"
+        )
+
+        # 같은 분에 게시하는 길드들은 동시에 깨어나므로, 저장 예약이 하나로 합쳐진다.
+        cfg["last_post_date"] = post_date
+        schedule_save()
+
+        try:
+            await fetch_and_post_horoscope(channel, gemini_key, mention_text, guild_id)
+        except Exception as e:
+            logging.error(f"길드 {guild_id} 자동 운세 게시 중 오류: {e}")
+
+
+def schedule_guild(guild_id: int) -> None:
+    """
+    길드의 자동 게시 태스크를 시작한다.
+    이미 돌고 있다면 깨워서 바뀐 설정으로 다음 게시 시각을 다시 계산하게 한다.
+    """
+    task = _guild_tasks.get(guild_id)
+    if task is not None and not task.done():
+        _guild_wakeups[guild_id].set()
+        return
 
-        await asyncio.sleep(30)
+    _guild_wakeups[guild_id] = asyncio.Event()
+    _guild_tasks[guild_id] = asyncio.create_task(_guild_scheduler(guild_id))
 
 
 # --- 이벤트 ---
 
+async def warm_horoscope_cache() -> None:
+    """
+    API 키가 설정된 길드들로 오늘자 운세 캐시를 미리 채운다.
+    동시 실행은 WARMUP_CONCURRENCY개로 제한하며, 캐시가 길드 공용이라
+    실제 네트워크 요청은 첫 번째 길드의 한 번뿐이고 나머지는 그 결과를 기다린다.
+    """
+    sem = asyncio.Semaphore(WARMUP_CONCURRENCY)
+
+    async def _warm(guild_id: int, gemini_api_key: str) -> None:
+        async with sem:
+            await get_today_horoscope_for_guild(guild_id, gemini_api_key)
+
+    warmups = []
+    for guild in client.guilds:
+        cfg = get_guild_settings(guild.id)
+        if cfg and cfg.get("gemini_api_key"):
+            warmups.append(_warm(guild.id, cfg["gemini_api_key"]))
+
+    results = await asyncio.gather(*warmups, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(f"운세 캐시 예열 중 오류: {result}")
+
+
 @client.event
 async def on_ready():
     try:
@@ -502,24 +979,12 @@ async def on_ready():
         logging.info(f"현재 {len(client.guilds)}개의 서버에 연결됨")
         logging.info("------")
 
-        # 자동 스케줄러 시작
-        client.loop.create_task(scheduler_loop())
+        # 길드별 자동 게시 태스크 시작 (재연결로 on_ready가 다시 와도 중복 생성되지 않음)
+        for guild_id in list(guild_settings):
+            schedule_guild(guild_id)
 
         # 미리 오늘자 데이터 캐싱 시도 (옵셔널)
-        for guild in client.guilds:
-            cfg = get_guild_settings(guild.id)
-            if cfg and cfg.get("gemini_api_key"):
-                client.loop.create_task(
-                    get_today_horoscope_for_guild(guild.id, cfg["gemini_api_key"])
-                )
-
-        # 봇이 켜지면 딱 한 번만 데이터 로딩 시도
-        for guild in client.guilds:
-            cfg = get_guild_settings(guild.id)
-            if cfg and cfg.get("gemini_api_key"):
-                # 캐시가 없는 상태에서 딱 하나만 시도
-                asyncio.create_task(get_today_horoscope_for_guild(guild.id, cfg["gemini_api_key"]))
-                break
+        await warm_horoscope_cache()
 
     except Exception as e:
         logging.error(f"on_ready 중 오류: {e}")
@@ -561,7 +1026,8 @@ class Ohaasa(app_commands.Group):
         target_channel = channel or interaction.channel
         cfg = get_or_create_guild_settings(interaction.guild.id)
         cfg["channel_id"] = target_channel.id
-        save_guild_config()
+        schedule_save()
+        schedule_guild(interaction.guild.id)
 
         await interaction.response.send_message(
             f"✅ 이제 이 서버의 오하아사 운세는 {target_channel.mention} 에 게시됩니다.",
@@ -587,7 +1053,8 @@ class Ohaasa(app_commands.Group):
 
         cfg = get_or_create_guild_settings(interaction.guild.id)
         cfg["gemini_api_key"] = api_key.strip()
-        save_guild_config()
+        schedule_save()
+        schedule_guild(interaction.guild.id)
 
         await interaction.response.send_message(
             "✅ Gemini API 키를 저장했습니다.\n"
@@ -616,7 +1083,8 @@ class Ohaasa(app_commands.Group):
         cfg = get_or_create_guild_settings(interaction.guild.id)
         cfg["post_hour"] = int(hour)
         cfg["post_minute"] = int(minute)
-        save_guild_config()
+        schedule_save()
+        schedule_guild(interaction.guild.id)
 
         await interaction.response.send_message(
             f"✅ 매일 **{hour:02d}:{minute:02d} (KST)** 에 자동으로 오하아사 운세를 게시하도록 설정했습니다.\n"
@@ -674,7 +1142,7 @@ class Ohaasa(app_commands.Group):
             cfg["mention_role_id"] = None
             msg = "✅ 이제 오하아사 운세 게시 시 멘션을 하지 않습니다."
 
-        save_guild_config()
+        schedule_save()
         await interaction.response.send_message(msg, ephemeral=True)
 
     # /ohaasa config
@@ -706,7 +1174,7 @@ class Ohaasa(app_commands.Group):
             f"<#{ch_id}>" if ch_id else "아직 설정되지 않음 (`/ohaasa channel`)"
         )
         time_str = (
-            f"{int(hour):02d}:{int(minute):02d}"
+            f"{hour:02d}:{minute:02d}"
             if hour is not None and minute is not None
             else "아직 설정되지 않음 (`/ohaasa time`)"
         )
@@ -716,7 +1184,7 @@ class Ohaasa(app_commands.Group):
         if mention_mode == "everyone":
             mention_str = "@everyone"
         elif mention_mode == "role" and mention_role_id:
-            mention_str = f"<@&{int(mention_role_id)}>"
+            mention_str = f"<@&{mention_role_id}>"
         else:
             mention_str = "멘션 없음"
 
@@ -768,7 +1236,7 @@ class Ohaasa(app_commands.Group):
             )
             return
 
-        channel = client.get_channel(int(ch_id))
+        channel = client.get_channel(ch_id)
         if not channel:
             await interaction.response.send_message(
                 f"❌ 설정된 채널 <#{ch_id}> 을(를) 찾을 수 없습니다. "
@@ -785,7 +1253,7 @@ class Ohaasa(app_commands.Group):
         if mode == "everyone":
             mention_text = "@everyone"
         elif mode == "role" and role_id:
-            mention_text = f"<@&{int(role_id)}>"
+            mention_text = f"<@&{role_id}>"
 
         await interaction.response.send_message(
             f"✅ {channel.mention} 에 오늘의 오하아사 운세를 테스트로 게시합니다.",
@@ -826,10 +1294,23 @@ async def perms_error(
 
 # --- 실행 진입점 ---
 
+async def main() -> None:
+    """봇을 실행하고, 종료 시 공용 HTTP 세션을 정리한다."""
+    try:
+        async with client:
+            await client.start(DISCORD_BOT_TOKEN)
+    finally:
+        await flush_guild_config()
+        await close_session()
+
+
 if __name__ == "__main__":
     load_guild_config()
+    load_horoscope_cache()
     try:
-        client.run(DISCORD_BOT_TOKEN)
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
     except discord.errors.LoginFailure:
         logging.error("오류: 디스코드 봇 토큰이 잘못되었습니다.")
     except Exception as e: